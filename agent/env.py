@@ -1,11 +1,55 @@
-import random
-import tkinter as tk
-from tkinter import Canvas
-from typing import Any
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
 
 import gymnasium as gym
 import numpy as np
-from reversi_rl import Board
+from reversi_rl import Board, VecBoard
+
+if TYPE_CHECKING:  # tkinter is imported lazily by _ensure_gui()
+    import tkinter as tk
+    from tkinter import Canvas
+
+logger = logging.getLogger(__name__)
+
+
+def _moves_from_mask(mask: int) -> list[int]:
+    """Expand a `Board.legal_mask()` bitmask into a list of move indices."""
+    moves = []
+    while mask:
+        moves.append((mask & -mask).bit_length() - 1)
+        mask &= mask - 1
+    return moves
+
+
+class IndexSampler:
+    """Uniform random indices served from a pre-drawn block of uniforms.
+
+    Drawing `block` floats at once from a PCG64 `Generator` amortises the
+    per-call RNG overhead over many moves.
+    """
+
+    def __init__(self, seed: int | None = None, block: int = 4096):
+        self._block = block
+        self.seed(seed)
+
+    def seed(self, seed: int | None) -> None:
+        self._rng = np.random.default_rng(seed)
+        self._refill()
+
+    def _refill(self) -> None:
+        # tolist() so that indexing yields plain floats, not NumPy scalars
+        self._uniforms: list[float] = self._rng.random(self._block).tolist()
+        self._pos = 0
+
+    def index(self, n: int) -> int:
+        """Return a random integer in [0, n)."""
+        if self._pos == self._block:
+            self._refill()
+        u = self._uniforms[self._pos]
+        self._pos += 1
+        return int(u * n)
 
 
 class ReversiEnv(gym.Env):
@@ -14,18 +58,29 @@ class ReversiEnv(gym.Env):
     The GUI is created lazily when `render()` is called in "human" mode.
     Clicking on a square issues the corresponding action and triggers the
     environment's `step`, so you can play against the built‑in random opponent.
+
+    `action_space` and `observation_space` are class-level objects shared by
+    all instances, so `env.action_space.seed(...)` reseeds the `sample()`
+    stream of every `ReversiEnv` (and of `VecReversiEnv.single_*_space`).
+    Assign a fresh space to an instance if it needs an independent sampler.
     """
 
     metadata: dict[str, list[str]] = {"render_modes": ["human"]}
+    # keyed by Board.as_bytes() values: white (-1) is 0xFF as an unsigned byte
+    SYMBOLS: dict[int, str] = {1: "black", 0xFF: "white"}
+
+    # shared by every instance (and VecReversiEnv's single_* spaces) to skip
+    # rebuilding them; note their sampler RNG is shared too
+    _ACTION_SPACE = gym.spaces.Discrete(64 + 1)  # 64 squares + pass
+    _OBS_SPACE = gym.spaces.Box(low=-1, high=1, shape=(65,), dtype=np.int8)
 
     def __init__(self, seed: int | None = None, manual_mode: bool = False):
         super().__init__()
-        self.rng = random.Random(seed)
+        self.rng = IndexSampler(seed)  # rng.seed(seed) reseeds the opponent
+        self._rand_idx = self.rng.index
         self.board = Board()
-        self.action_space = gym.spaces.Discrete(64 + 1)  # 64 squares + pass
-        self.observation_space = gym.spaces.Box(
-            low=-1, high=1, shape=(65,), dtype=np.int8
-        )
+        self.action_space = ReversiEnv._ACTION_SPACE
+        self.observation_space = ReversiEnv._OBS_SPACE
         self.manual_mode = manual_mode
 
         # GUI elements (created on demand)
@@ -33,6 +88,12 @@ class ReversiEnv(gym.Env):
         self._canvas: Canvas | None = None
         self._pass_button: tk.Button | None = None
         self._cell_size: int = 60
+        # 差分描画用: 前回描画した盤面と各マスの石の canvas id
+        self._prev_cells: bytes = bytes(64)
+        self._stone_ids: dict[int, int] = {}
+        # マスごとの描画座標 (_ensure_gui で計算)
+        self._oval_coords: list[tuple[int, int, int, int]] = []
+        self._text_coords: list[tuple[int, int]] = []
         self._terminated: bool = False
         self._consecutive_passes: int = 0  # 連続パス回数
 
@@ -45,106 +106,122 @@ class ReversiEnv(gym.Env):
         self._consecutive_passes = 0
         if self._canvas is not None:
             self._draw_board()  # refresh GUI if it exists
-        obs = np.array(self.board.as_list() + [1], dtype=np.int8)
-        return obs, {}
+        return (
+            self._observation(self.board.as_bytes(), self.board.get_black_to_move()),
+            {},
+        )
 
     def step(self, action: int):  # type: ignore[override]
-        legal = self.board.legal_moves()
+        action = int(action)  # NumPy 整数だと 64bit マスクのシフトが溢れる
+        # 手番開始時の盤面はここで一度だけ取得する
+        legal_mask = self.board.legal_mask()
+        cells = self.board.as_bytes()
+        black_to_move = self.board.get_black_to_move()
         reward: int = 0
         self._terminated = False
 
         # 観測値を作成
-        obs = np.array(
-            self.board.as_list() + [1 if self.board.get_black_to_move() else -1],
-            dtype=np.int8,
-        )
+        obs = self._observation(cells, black_to_move)
 
         # 盤面が埋まっているかチェック
-        board_state = self.board.as_list()
-        if all(cell != 0 for cell in board_state):
-            print("\nGame over: Board is full!")
+        if 0 not in cells:
+            logger.debug("\nGame over: Board is full!")
             self._terminated = True
-            black, white = self.board.counts()
-            print("\nFinal score:")
-            print(f"Black: {black}")
-            print(f"White: {white}")
-            print(
-                f"\n{'Black' if black > white else 'White' if white > black else 'No one'} wins!"
-            )
-            reward = 1 if black > white else -1 if black < white else 0
+            reward = self._final_reward(*self.board.counts())
             return obs, reward, self._terminated, False, {}
 
         # 現在のプレイヤーの手
-        print(
-            f"\nCurrent player: {'Black' if self.board.get_black_to_move() else 'White'}"
-        )
-        print(f"Legal moves: {legal}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\nCurrent player: %s", "Black" if black_to_move else "White")
+            logger.debug("Legal moves: %s", _moves_from_mask(legal_mask))
 
-        if action != 64 and action in legal:
-            print(f"Playing at {action}")
+        if 0 <= action < 64 and (legal_mask >> action) & 1:
+            logger.debug("Playing at %d", action)
             self.board.play(action)
             self._consecutive_passes = 0
         else:
-            if not legal:
-                print("Passing...")
+            if legal_mask == 0:
+                logger.debug("Passing...")
                 self._consecutive_passes += 1
                 self.board.pass_turn()
             else:
-                print("Cannot pass when legal moves are available!")
+                logger.debug("Cannot pass when legal moves are available!")
                 return obs, reward, self._terminated, False, {}
 
         # 相手の手
-        opp_moves = self.board.legal_moves()
-        print(f"Opponent's legal moves: {opp_moves}")
-        if opp_moves:
-            opp_action = self.rng.choice(opp_moves)
-            print(f"Opponent plays at {opp_action}")
+        opp_mask = self.board.legal_mask()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Opponent's legal moves: %s", _moves_from_mask(opp_mask))
+        if opp_mask:
+            if opp_mask & (opp_mask - 1) == 0:  # 合法手が1つだけなら乱数は不要
+                opp_action = opp_mask.bit_length() - 1
+            else:
+                opp_moves = self.board.legal_moves()
+                opp_action = opp_moves[self._rand_idx(len(opp_moves))]
+            logger.debug("Opponent plays at %d", opp_action)
             self.board.play(opp_action)
             self._consecutive_passes = 0
 
-            # 相手の手の後で盤面が埋まっているかチェック
-            board_state = self.board.as_list()
-            if all(cell != 0 for cell in board_state):
-                print("\nGame over: Board is full!")
+            # 相手の手の後で盤面が埋まっているかチェック (石数の合計で判定)
+            black, white = self.board.counts()
+            if black + white == 64:
+                logger.debug("\nGame over: Board is full!")
                 self._terminated = True
-                black, white = self.board.counts()
-                print("\nFinal score:")
-                print(f"Black: {black}")
-                print(f"White: {white}")
-                print(
-                    f"\n{'Black' if black > white else 'White' if white > black else 'No one'} wins!"
-                )
-                reward = 1 if black > white else -1 if black < white else 0
+                reward = self._final_reward(black, white)
                 return obs, reward, self._terminated, False, {}
         else:
-            print("Opponent passes...")
+            logger.debug("Opponent passes...")
             self._consecutive_passes += 1
             self.board.pass_turn()
             if self._consecutive_passes >= 2:
-                print("\nGame over: Both players passed")
+                logger.debug("\nGame over: Both players passed")
                 self._terminated = True
 
         # ゲーム終了時の処理
         if self._terminated:
-            black, white = self.board.counts()
-            print("\nFinal score:")
-            print(f"Black: {black}")
-            print(f"White: {white}")
-            print(
-                f"\n{'Black' if black > white else 'White' if white > black else 'No one'} wins!"
-            )
-            reward = 1 if black > white else -1 if black < white else 0
-        elif self._canvas is not None:
+            reward = self._final_reward(*self.board.counts())
+            return obs, reward, self._terminated, False, {}
+        if self._canvas is not None:
             self._draw_board()
 
         return obs, reward, self._terminated, False, {}
 
+    def _final_reward(self, black: int, white: int) -> int:
+        """Log the final score and return the result from black's view."""
+        logger.debug("\nFinal score:\nBlack: %d\nWhite: %d", black, white)
+        logger.debug(
+            "\n%s wins!",
+            "Black" if black > white else "White" if white > black else "No one",
+        )
+        return 1 if black > white else -1 if black < white else 0
+
+    def _observation(self, cells: bytes, black_to_move: bool) -> np.ndarray:
+        """Board cells followed by the side to move (1 = black, -1 = white).
+
+        The cells are copied straight from the Rust byte buffer into a fresh
+        array, so callers may keep it.
+        """
+        obs = np.empty(65, dtype=np.int8)
+        obs[:64] = np.frombuffer(cells, dtype=np.int8)
+        obs[64] = 1 if black_to_move else -1
+        return obs
+
     # -------------------------- GUI helpers ---------------------------
     def _ensure_gui(self) -> None:
         if self._tk is not None:
             return
+        import tkinter as tk
+        from tkinter import Canvas
+
         self._tk = tk.Tk()
         self._tk.title("Reversi RL")
+        s = self._cell_size
+        half = s // 2
+        squares = [(i >> 3, i & 7) for i in range(64)]  # (row, col)
+        self._oval_coords = [
+            (c * s + 4, r * s + 4, (c + 1) * s - 4, (r + 1) * s - 4) for r, c in squares
+        ]
+        self._text_coords = [(c * s + half, r * s + half) for r, c in squares]
         px = self._cell_size * 8
         button_height = 50  # パスボタンの領域の高さ
 
@@ -160,6 +237,8 @@ class ReversiEnv(gym.Env):
             self._tk, width=px, height=px, bg="#388e3c", highlightthickness=0
         )
         self._canvas.pack(pady=(0, 0))  # 上下のパディングを0に設定
+        self._prev_cells = bytes(64)  # 新しい canvas には石がない
+        self._stone_ids.clear()
         self._draw_grid()
         self._canvas.bind("<Button-1>", self._on_click)
 
@@ -188,32 +267,32 @@ class ReversiEnv(gym.Env):
 
     def _draw_board(self) -> None:
         assert self._canvas is not None
-        size = self._cell_size
-        self._canvas.delete("stone")
-        symbols = {1: "black", -1: "white"}
-        cells = self.board.as_list()
-        for idx, val in enumerate(cells):
-            if val == 0:
+        symbols = self.SYMBOLS
+        cells = self.board.as_bytes()
+        # redraw only the squares that changed since the last frame
+        for idx, (old, val) in enumerate(zip(self._prev_cells, cells)):
+            if old == val:
                 continue
-            r, c = divmod(idx, 8)
-            x0 = c * size + 4
-            y0 = r * size + 4
-            x1 = (c + 1) * size - 4
-            y1 = (r + 1) * size - 4
-            self._canvas.create_oval(x0, y0, x1, y1, fill=symbols[val], tags="stone")
-        # highlight legal moves for current player
+            if val == 0:
+                self._canvas.delete(self._stone_ids.pop(idx))
+            elif idx in self._stone_ids:
+                self._canvas.itemconfigure(self._stone_ids[idx], fill=symbols[val])
+            else:
+                self._stone_ids[idx] = self._canvas.create_oval(
+                    *self._oval_coords[idx], fill=symbols[val], tags="stone"
+                )
+        self._prev_cells = cells
+        # highlight legal moves for current player (changes every turn)
+        self._canvas.delete("marker")
+        font = ("Helvetica", self._cell_size // 2)
         legal_moves = self.board.legal_moves()
         for idx in legal_moves:
-            r, c = divmod(idx, 8)
-            x = c * size + size / 2
-            y = r * size + size / 2
             self._canvas.create_text(
-                x,
-                y,
+                *self._text_coords[idx],
                 text="·",
                 fill="yellow",
-                font=("Helvetica", size // 2),
-                tags="stone",
+                font=font,
+                tags="marker",
             )
         if self._tk is not None:
             self._tk.update_idletasks()
@@ -232,7 +311,7 @@ class ReversiEnv(gym.Env):
         row = int(event.y // size)
         if 0 <= row < 8 and 0 <= col < 8:
             idx = row * 8 + col
-            if idx in self.board.legal_moves():
+            if (self.board.legal_mask() >> idx) & 1:
                 _, _, self._terminated, _, _ = self.step(
                     idx
                 )  # GUI refresh happens inside
@@ -265,3 +344,60 @@ class ReversiEnv(gym.Env):
                     self._pass_button.config(state="disabled", bg="#cccccc")  # グレー
             self._tk.update_idletasks()
             self._tk.update()
+
+
+class VecReversiEnv(gym.vector.VectorEnv):
+    """`num_envs` independent Reversi games stepped by one Rust call.
+
+    Each game plays a random opponent like `ReversiEnv`, without the GUI or
+    console output, but trajectories are not identical to `ReversiEnv`:
+
+    * `step` returns the observation after the opponent's reply, whereas
+      `ReversiEnv.step` returns the observation from before the action.
+    * A move that fills the board ends the game on that same step, whereas
+      `ReversiEnv` lets the opponent pass and reports the full board on the
+      following call.
+
+    A finished game is reset on the following `step` (next-step autoreset).
+
+    The arrays returned by `reset` and `step` are reused buffers that the
+    next call overwrites; copy them if you need to keep them.
+    """
+
+    metadata = {"autoreset_mode": gym.vector.AutoresetMode.NEXT_STEP}
+
+    def __init__(self, num_envs: int, seed: int | None = None):
+        self.num_envs = num_envs
+        self.single_action_space = ReversiEnv._ACTION_SPACE
+        self.single_observation_space = ReversiEnv._OBS_SPACE
+        self.action_space = gym.vector.utils.batch_space(
+            self.single_action_space, num_envs
+        )
+        self.observation_space = gym.vector.utils.batch_space(
+            self.single_observation_space, num_envs
+        )
+        self.boards = VecBoard(num_envs)
+        self._np_random, self._np_random_seed = gym.utils.seeding.np_random(seed)
+
+        # Rust 側が直接書き込むバッファ
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+        self._uniforms = np.zeros(num_envs, dtype=np.float64)
+        self._obs = np.zeros((num_envs, 65), dtype=np.int8)
+        self._rewards = np.zeros(num_envs, dtype=np.int8)
+        self._dones = np.zeros(num_envs, dtype=np.bool_)
+        self._dones_u8 = self._dones.view(np.uint8)
+        self._truncations = np.zeros(num_envs, dtype=np.bool_)
+
+    def reset(self, *, seed: int | None = None, options: dict[str, Any] | None = None):  # type: ignore[override]
+        super().reset(seed=seed)
+        self.boards.reset()
+        self.boards.observe(self._obs)
+        return self._obs, {}
+
+    def step(self, actions: np.ndarray):  # type: ignore[override]
+        self._actions[:] = actions
+        self.np_random.random(out=self._uniforms)
+        self.boards.step_batch(
+            self._actions, self._uniforms, self._obs, self._rewards, self._dones_u8
+        )
+        return self._obs, self._rewards, self._dones, self._truncations, {}
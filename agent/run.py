@@ -5,14 +5,18 @@ Usage:
     python -m agent.run         # Manual play mode
 """
 
+from __future__ import annotations
+
+import logging
 import os
+import sys
 import time
-import tkinter as tk
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
-import numpy as np
+from agent.env import IndexSampler, ReversiEnv
 
-from agent.env import ReversiEnv
+if TYPE_CHECKING:
+    import tkinter as tk
 
 
 class Player(Protocol):
@@ -26,10 +30,13 @@ class Player(Protocol):
 class AutoPlayer:
     """自動プレイヤー（ランダム）"""
 
+    def __init__(self, seed: int | None = None) -> None:
+        self._rand_idx = IndexSampler(seed).index
+
     def get_action(self, env: ReversiEnv) -> int:
         legal_moves = env.board.legal_moves()
         if legal_moves:
-            action = np.random.choice(legal_moves)
+            action = legal_moves[self._rand_idx(len(legal_moves))]
             print(f"Auto: Playing at {action}")
             return action
         print("Auto: Passing")
@@ -40,25 +47,33 @@ class ManualPlayer:
     """手動プレイヤー（マウスクリック）"""
 
     def __init__(self) -> None:
-        self._action: int | None = None
+        # Tk ウィンドウができてから setup_manual_player で作成する
+        self._var: tk.IntVar | None = None
+        # 待機開始前に処理されたクリックも失わないように保持する
+        self._pending: int | None = None
         self._click_event = None
 
     def get_action(self, env: ReversiEnv) -> int:
         """クリックイベントで設定されたアクションを返す"""
+        if env._terminated:  # ゲーム終了時はパスを返して終了
+            return 64
+        if self._var is None or env._tk is None:
+            raise RuntimeError("setup_manual_player() must be called first")
         print("Waiting for click...")
-        while self._action is None:
-            if env._terminated:  # ゲーム終了時はループを抜ける
-                return 64  # パスを返して終了
-            env.update_gui()  # GUIの更新
-            time.sleep(0.1)
-        action = self._action
-        self._action = None
+        env.update_gui()  # パスボタンの状態を更新
+        # 未処理のクリックがなければ、変数が書き込まれるまで Tk のイベントループで待機する
+        while self._pending is None:
+            env._tk.wait_variable(self._var)
+        action = self._pending
+        self._pending = None
         return action
 
     def set_action(self, action: int) -> None:
         """クリックイベントでアクションを設定"""
         print(f"Setting action: {action}")
-        self._action = action
+        self._pending = action
+        if self._var is not None:
+            self._var.set(action)  # wait_variable の待機を解除
 
 
 def play_game(env: ReversiEnv, player: Player) -> None:
@@ -117,6 +132,7 @@ def play_game(env: ReversiEnv, player: Player) -> None:
 
 def setup_manual_player(env: ReversiEnv, player: ManualPlayer) -> None:
     """手動プレイヤーのクリックイベントを設定"""
+    import tkinter as tk
 
     def on_click(event: tk.Event) -> None:
         print("Click detected!")
@@ -127,15 +143,19 @@ def setup_manual_player(env: ReversiEnv, player: ManualPlayer) -> None:
         row = int(event.y // size)
         if 0 <= row < 8 and 0 <= col < 8:
             idx = row * 8 + col
-            if idx in env.board.legal_moves():
+            if (env.board.legal_mask() >> idx) & 1:
                 print(f"Legal move at {idx}")
                 player.set_action(idx)
             else:
                 print("不正な手です!")
 
     if env._canvas is not None:
+        player._var = tk.IntVar(master=env._tk, value=64)
         env._canvas.bind("<Button-1>", on_click)
         print("Click event bound to canvas")
+        if env._pass_button is not None:
+            # パスも get_action の待機を解除する
+            env._pass_button.config(command=lambda: player.set_action(64))
     else:
         print("GUIが見つかりません")
 
@@ -145,6 +165,10 @@ if __name__ == "__main__":
         env = ReversiEnv()
         play_game(env, AutoPlayer())
     else:
+        # 手動プレイでは環境の進行ログ (DEBUG) も標準出力に表示する
+        env_logger = logging.getLogger("agent.env")
+        env_logger.setLevel(logging.DEBUG)
+        env_logger.addHandler(logging.StreamHandler(sys.stdout))
         env = ReversiEnv(manual_mode=True)  # 手動モード設定
         player = ManualPlayer()
         # 最初のrender()を呼び出してGUIを初期化
@@ -1,13 +1,31 @@
+from collections.abc import Buffer
+
 class Board:
-    cells: list[int]
     black_to_move: bool
 
     def __init__(self) -> None: ...
     def reset(self) -> None: ...
     def is_legal(self, idx: int) -> bool: ...
+    def legal_mask(self) -> int: ...  # bit i set if idx i is legal
     def legal_moves(self) -> list[int]: ...
     def play(self, idx: int) -> int: ...  # returns stones flipped, may raise ValueError
     def counts(self) -> tuple[int, int]: ...
     def as_list(self) -> list[int]: ...
+    def as_bytes(self) -> bytes: ...
     def get_black_to_move(self) -> bool: ...
     def pass_turn(self) -> None: ...
+
+class VecBoard:
+    def __init__(self, n: int) -> None: ...
+    def __len__(self) -> int: ...
+    def reset(self) -> None: ...
+    def legal_masks(self) -> list[int]: ...
+    def observe(self, out_obs: Buffer) -> None: ...  # int8, (n, 65)
+    def step_batch(
+        self,
+        actions: Buffer,  # int64, (n,)
+        uniforms: Buffer,  # float64 in [0, 1), (n,)
+        out_obs: Buffer,  # int8, (n, 65)
+        out_rew: Buffer,  # int8, (n,)
+        out_done: Buffer,  # uint8, (n,)
+    ) -> None: ...
@@ -1,10 +1,37 @@
+use pyo3::buffer::PyBuffer;
 use pyo3::prelude::*;
+use pyo3::types::PyBytes;
 
-/// Internal stone representation (0 = empty, 1 = black, -1 = white).
+/// Masks that drop bits which wrapped around to the A (leftmost) or
+/// H (rightmost) file after a shift.
+const NOT_A_FILE: u64 = 0xfefe_fefe_fefe_fefe;
+const NOT_H_FILE: u64 = 0x7f7f_7f7f_7f7f_7f7f;
+
+/// The eight directions as (index delta, wrap mask), idx = row * 8 + col.
+const DIRS: [(i8, u64); 8] = [
+    (1, NOT_A_FILE),
+    (-1, NOT_H_FILE),
+    (8, u64::MAX),
+    (-8, u64::MAX),
+    (9, NOT_A_FILE),
+    (-9, NOT_H_FILE),
+    (7, NOT_H_FILE),
+    (-7, NOT_A_FILE),
+];
+
+/// Move every bit of `x` one square in direction `d`, dropping wrapped bits.
+#[inline]
+fn shift(x: u64, d: i8, mask: u64) -> u64 {
+    (if d > 0 { x << d } else { x >> -d }) & mask
+}
+
+/// Board as two bitboards (bit idx set = stone on idx).
+/// Python sees cells as 0 = empty, 1 = black, -1 = white.
 #[pyclass]
 #[derive(Clone)]
 pub struct Board {
-    cells: [i8; 64],
+    black: u64,
+    white: u64,
     black_to_move: bool,
 }
 
@@ -13,14 +40,10 @@ impl Board {
     /// Create the initial reversi position.
     #[new]
     pub fn new() -> Self {
-        let mut cells = [0i8; 64];
         // central four stones
-        cells[27] = -1;
-        cells[28] = 1;
-        cells[35] = 1;
-        cells[36] = -1;
         Self {
-            cells,
+            black: (1 << 28) | (1 << 35),
+            white: (1 << 27) | (1 << 36),
             black_to_move: true,
         }
     }
@@ -37,49 +60,34 @@ impl Board {
 
     /// Return true if idx (0‑63) is a legal move for current side.
     pub fn is_legal(&self, idx: usize) -> bool {
-        if self.cells[idx] != 0 {
-            return false;
-        }
-        const DIRS: [i8; 8] = [-9, -8, -7, -1, 1, 7, 8, 9];
-        let my = if self.black_to_move { 1 } else { -1 };
-        let opp = -my;
-        let _r = idx as i8 / 8;
-        let c = idx as i8 % 8;
-        for d in DIRS {
-            // step in each direction
-            let mut x = idx as i8 + d;
-            let mut cnt = 0;
-            while (0..64).contains(&x) {
-                let _xr = x / 8;
-                let xc = x % 8;
-                // board wrap check
-                if (d == -1 || d == 7 || d == -9) && xc > c {
-                    break;
-                }
-                if (d == 1 || d == -7 || d == 9) && xc < c {
-                    break;
-                }
-                let s = self.cells[x as usize];
-                if s == opp {
-                    cnt += 1;
-                } else if s == my {
-                    if cnt > 0 {
-                        return true;
-                    } else {
-                        break;
-                    }
-                } else {
-                    break;
-                }
-                x += d;
+        idx < 64 && (self.legal_mask() >> idx) & 1 == 1
+    }
+
+    /// Bitmask of legal moves for current side (bit i set = idx i legal).
+    pub fn legal_mask(&self) -> u64 {
+        let (me, opp) = self.sides();
+        let empty = !(me | opp);
+        let mut moves = 0u64;
+        for (d, mask) in DIRS {
+            // runs of up to six opponent stones adjacent to our own
+            let mut x = shift(me, d, mask) & opp;
+            for _ in 0..5 {
+                x |= shift(x, d, mask) & opp;
             }
+            moves |= shift(x, d, mask) & empty;
         }
-        false
+        moves
     }
 
     /// Vector of all legal move indices for current side.
     pub fn legal_moves(&self) -> Vec<usize> {
-        (0..64).filter(|&i| self.is_legal(i)).collect()
+        let mut mask = self.legal_mask();
+        let mut moves = Vec::with_capacity(mask.count_ones() as usize);
+        while mask != 0 {
+            moves.push(mask.trailing_zeros() as usize);
+            mask &= mask - 1;
+        }
+        moves
     }
 
     /// Play a move; returns number of stones flipped, or Err if illegal.
@@ -89,61 +97,44 @@ impl Board {
                 "Illegal move",
             ));
         }
-        const DIRS: [i8; 8] = [-9, -8, -7, -1, 1, 7, 8, 9];
-        let my = if self.black_to_move { 1 } else { -1 };
-        let opp = -my;
-        let _r = idx as i8 / 8;
-        let c = idx as i8 % 8;
-        let mut flipped = 0;
-        self.cells[idx] = my;
-        for d in DIRS {
-            let mut buf: Vec<usize> = Vec::new();
-            let mut x = idx as i8 + d;
-            while (0..64).contains(&x) {
-                let _xr = x / 8;
-                let xc = x % 8;
-                if (d == -1 || d == 7 || d == -9) && xc > c {
-                    break;
-                }
-                if (d == 1 || d == -7 || d == 9) && xc < c {
-                    break;
-                }
-                let s = self.cells[x as usize];
-                if s == opp {
-                    buf.push(x as usize);
-                } else if s == my {
-                    for i in &buf {
-                        self.cells[*i] = my;
-                    }
-                    flipped += buf.len();
-                    break;
-                } else {
-                    break;
-                }
-                x += d;
+        let (me, opp) = self.sides();
+        let mv = 1u64 << idx;
+        let mut flips = 0u64;
+        for (d, mask) in DIRS {
+            let mut line = 0u64;
+            let mut x = shift(mv, d, mask);
+            while x & opp != 0 {
+                line |= x;
+                x = shift(x, d, mask);
+            }
+            if x & me != 0 {
+                flips |= line;
             }
         }
+        let (me, opp) = (me | mv | flips, opp & !flips);
+        if self.black_to_move {
+            (self.black, self.white) = (me, opp);
+        } else {
+            (self.white, self.black) = (me, opp);
+        }
         self.black_to_move = !self.black_to_move;
-        Ok(flipped as usize)
+        Ok(flips.count_ones() as usize)
     }
 
     /// Return (black, white) counts.
     pub fn counts(&self) -> (u8, u8) {
-        let mut b = 0u8;
-        let mut w = 0u8;
-        for &c in &self.cells {
-            if c == 1 {
-                b += 1;
-            } else if c == -1 {
-                w += 1;
-            }
-        }
-        (b, w)
+        (self.black.count_ones() as u8, self.white.count_ones() as u8)
     }
 
     /// Python helper to get simple list for observation.
     pub fn as_list(&self) -> Vec<i8> {
-        self.cells.to_vec()
+        self.cells().to_vec()
+    }
+
+    /// Cells as raw bytes (two's complement i8, so white is 0xFF).
+    /// View with `np.frombuffer(..., dtype=np.int8)` to avoid boxing each cell.
+    pub fn as_bytes<'py>(&self, py: Python<'py>) -> Bound<'py, PyBytes> {
+        PyBytes::new_bound(py, &self.cell_bytes())
     }
 
     /// Pass the turn
@@ -152,9 +143,206 @@ impl Board {
     }
 }
 
+impl Board {
+    /// (side to move, opponent) bitboards.
+    fn sides(&self) -> (u64, u64) {
+        if self.black_to_move {
+            (self.black, self.white)
+        } else {
+            (self.white, self.black)
+        }
+    }
+
+    /// Cells as 0 / 1 / -1.
+    fn cells(&self) -> [i8; 64] {
+        let mut cells = [0i8; 64];
+        for (i, cell) in cells.iter_mut().enumerate() {
+            *cell = ((self.black >> i) & 1) as i8 - ((self.white >> i) & 1) as i8;
+        }
+        cells
+    }
+
+    /// Copy of the cells reinterpreted as bytes.
+    fn cell_bytes(&self) -> [u8; 64] {
+        self.cells().map(|c| c as u8)
+    }
+
+    /// Write the cells followed by the side to move (1 / -1) into `out`.
+    fn write_obs(&self, out: &mut [i8]) {
+        out[..64].copy_from_slice(&self.cells());
+        out[64] = if self.black_to_move { 1 } else { -1 };
+    }
+
+    fn is_full(&self) -> bool {
+        self.black | self.white == u64::MAX
+    }
+
+    /// Game result from black's point of view.
+    fn reward(&self) -> i8 {
+        let (black, white) = self.counts();
+        (black as i8 - white as i8).signum()
+    }
+}
+
+/// Length of one observation row: 64 cells + side to move.
+const OBS_LEN: usize = 65;
+
+/// Pick the `n`-th (0-based) set bit of `mask`.
+fn nth_set_bit(mut mask: u64, n: u32) -> usize {
+    for _ in 0..n {
+        mask &= mask - 1;
+    }
+    mask.trailing_zeros() as usize
+}
+
+/// A batch of independent boards, each playing a random opponent.
+///
+/// `step_batch` advances every board with a single Python call and writes
+/// the results into caller-owned NumPy buffers. A board whose game ended
+/// is reset on the next `step_batch` call.
+#[pyclass]
+pub struct VecBoard {
+    boards: Vec<Board>,
+    passes: Vec<u8>,
+    done: Vec<bool>,
+}
+
+#[pymethods]
+impl VecBoard {
+    #[new]
+    pub fn new(n: usize) -> Self {
+        Self {
+            boards: vec![Board::new(); n],
+            passes: vec![0; n],
+            done: vec![false; n],
+        }
+    }
+
+    pub fn __len__(&self) -> usize {
+        self.boards.len()
+    }
+
+    /// Reset every board to the initial position.
+    pub fn reset(&mut self) {
+        for b in &mut self.boards {
+            b.reset();
+        }
+        self.passes.fill(0);
+        self.done.fill(false);
+    }
+
+    /// Legal-move bitmask of every board for its side to move.
+    pub fn legal_masks(&self) -> Vec<u64> {
+        self.boards.iter().map(|b| b.legal_mask()).collect()
+    }
+
+    /// Write all observations into `out_obs` (int8, N x 65).
+    pub fn observe(&self, py: Python<'_>, out_obs: PyBuffer<i8>) -> PyResult<()> {
+        let mut obs = vec![0i8; self.boards.len() * OBS_LEN];
+        for (b, row) in self.boards.iter().zip(obs.chunks_exact_mut(OBS_LEN)) {
+            b.write_obs(row);
+        }
+        out_obs.copy_from_slice(py, &obs)
+    }
+
+    /// Step every board once.
+    ///
+    /// `actions` (int64, N) are the moves of the side to move (64 = pass) and
+    /// `uniforms` (float64 in [0, 1), N) pick the opponent's reply. Observations
+    /// after the reply, rewards (black's view, non-zero only when done) and
+    /// done flags are written into `out_obs` (int8, N x 65), `out_rew`
+    /// (int8, N) and `out_done` (uint8, N).
+    pub fn step_batch(
+        &mut self,
+        py: Python<'_>,
+        actions: PyBuffer<i64>,
+        uniforms: PyBuffer<f64>,
+        out_obs: PyBuffer<i8>,
+        out_rew: PyBuffer<i8>,
+        out_done: PyBuffer<u8>,
+    ) -> PyResult<()> {
+        let n = self.boards.len();
+        let actions = actions.to_vec(py)?;
+        let uniforms = uniforms.to_vec(py)?;
+        if actions.len() != n || uniforms.len() != n {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "expected {} actions and uniforms",
+                n
+            )));
+        }
+        let mut obs = vec![0i8; n * OBS_LEN];
+        let mut rew = vec![0i8; n];
+        let mut done = vec![0u8; n];
+        for i in 0..n {
+            if self.done[i] {
+                self.boards[i].reset();
+                self.passes[i] = 0;
+                self.done[i] = false;
+            } else {
+                let (r, d) = Self::step_one(
+                    &mut self.boards[i],
+                    &mut self.passes[i],
+                    actions[i],
+                    uniforms[i],
+                )?;
+                rew[i] = r;
+                done[i] = d as u8;
+                self.done[i] = d;
+            }
+            self.boards[i].write_obs(&mut obs[i * OBS_LEN..(i + 1) * OBS_LEN]);
+        }
+        out_obs.copy_from_slice(py, &obs)?;
+        out_rew.copy_from_slice(py, &rew)?;
+        out_done.copy_from_slice(py, &done)
+    }
+}
+
+impl VecBoard {
+    /// Move rules match `ReversiEnv.step`: an illegal move while legal moves
+    /// exist is ignored, and the game ends on a full board or two passes.
+    /// Unlike `ReversiEnv.step`, a full board ends the game on the step that
+    /// filled it (even the agent's own move), and the caller observes the
+    /// board after the opponent's reply rather than before the action.
+    fn step_one(board: &mut Board, passes: &mut u8, action: i64, u: f64) -> PyResult<(i8, bool)> {
+        let mask = board.legal_mask();
+        if (0..64).contains(&action) && (mask >> action) & 1 == 1 {
+            board.play(action as usize)?;
+            *passes = 0;
+            if board.is_full() {
+                return Ok((board.reward(), true));
+            }
+        } else if mask == 0 {
+            board.pass_turn();
+            *passes += 1;
+        } else {
+            return Ok((0, false));
+        }
+
+        // random opponent
+        let opp = board.legal_mask();
+        if opp != 0 {
+            let count = opp.count_ones();
+            let k = ((u * count as f64) as u32).min(count - 1);
+            board.play(nth_set_bit(opp, k))?;
+            *passes = 0;
+            if board.is_full() {
+                return Ok((board.reward(), true));
+            }
+        } else {
+            board.pass_turn();
+            *passes += 1;
+            if *passes >= 2 {
+                return Ok((board.reward(), true));
+            }
+        }
+        Ok((0, false))
+    }
+}
+
 #[pymodule]
 fn reversi_rl(_py: Python, m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<Board>()?;
+    m.add_class::<VecBoard>()?;
     Ok(())
 }
 
@@ -172,6 +360,16 @@ mod tests {
         }
     }
 
+    #[test]
+    fn legal_mask_matches_moves() {
+        let b = Board::new();
+        let mask = b.legal_mask();
+        assert_eq!(mask.count_ones(), 4);
+        for mv in b.legal_moves() {
+            assert_eq!((mask >> mv) & 1, 1);
+        }
+    }
+
     #[test]
     fn play_and_flip() {
         let mut b = Board::new();
@@ -180,4 +378,63 @@ mod tests {
         let (black, white) = b.counts();
         assert_eq!((black, white), (4, 1));
     }
+
+    #[test]
+    fn no_wrap_across_rows() {
+        // a white line filling row 1 west of 15, black at the end of row 0:
+        // walking west from 15 past 8 must not wrap onto 7.
+        let b = Board {
+            black: 1 << 7,
+            white: 0x7f << 8,
+            black_to_move: true,
+        };
+        assert!(!b.is_legal(15));
+        assert_eq!(b.legal_mask() >> 15 & 1, 0);
+    }
+
+    #[test]
+    fn fixed_opening_sequence() {
+        // (move, flipped, (black, white), legal moves of the side to move)
+        let expected: [(usize, usize, (u8, u8), &[usize]); 5] = [
+            (19, 1, (4, 1), &[18, 20, 34]),
+            (18, 1, (3, 3), &[17, 26, 37, 44]),
+            (17, 1, (5, 2), &[9, 11, 20, 29, 34, 43]),
+            (34, 1, (4, 4), &[26, 42, 43, 44, 45]),
+            (42, 1, (6, 3), &[9, 11, 20, 29, 43, 50]),
+        ];
+        let mut b = Board::new();
+        for (mv, flipped, counts, legal) in expected {
+            assert_eq!(b.play(mv).unwrap(), flipped);
+            assert_eq!(b.counts(), counts);
+            assert_eq!(b.legal_moves(), legal);
+        }
+    }
+
+    #[test]
+    fn nth_set_bit_picks_in_order() {
+        let mask = 0b1010_0100u64;
+        assert_eq!(nth_set_bit(mask, 0), 2);
+        assert_eq!(nth_set_bit(mask, 1), 5);
+        assert_eq!(nth_set_bit(mask, 2), 7);
+    }
+
+    #[test]
+    fn step_one_plays_both_sides() {
+        let mut b = Board::new();
+        let mut passes = 0u8;
+        let (reward, done) = VecBoard::step_one(&mut b, &mut passes, 19, 0.0).unwrap();
+        assert_eq!((reward, done), (0, false));
+        assert!(b.get_black_to_move());
+        let (black, white) = b.counts();
+        assert_eq!(black + white, 6);
+    }
+
+    #[test]
+    fn cell_bytes_encoding() {
+        let b = Board::new();
+        let bytes = b.cell_bytes();
+        assert_eq!(bytes[28], 1);
+        assert_eq!(bytes[27], 0xFF);
+        assert_eq!(bytes[0], 0);
+    }
 }
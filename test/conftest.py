@@ -5,6 +5,10 @@ import pytest
 
 from agent.env import ReversiEnv
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def env():
-    return ReversiEnv(seed=42)
+    # shared by every test in a module; call env.reset() if a test needs a
+    # fresh game
+    env = ReversiEnv(seed=42)
+    env.reset(seed=42)
+    yield env
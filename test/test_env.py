@@ -1,9 +1,10 @@
 """Smoke tests for the Gym environment."""
 from __future__ import annotations
 
+import gymnasium as gym
 import numpy as np
 
-from agent.env import ReversiEnv
+from agent.env import IndexSampler, ReversiEnv, VecReversiEnv
 
 
 def test_reset_and_step():
@@ -16,3 +17,55 @@ def test_reset_and_step():
     assert obs.shape == (65,)
     assert isinstance(reward, int)
     assert isinstance(terminated, bool)
+
+
+def test_index_sampler_is_seeded_across_refills():
+    # block=4 forces several refills within 10 draws
+    first = IndexSampler(seed=7, block=4)
+    draws = [first.index(5) for _ in range(10)]
+    assert all(0 <= i < 5 for i in draws)
+    second = IndexSampler(block=4)
+    second.seed(7)
+    assert [second.index(5) for _ in range(10)] == draws
+
+
+def test_out_of_range_action_is_illegal():
+    env = ReversiEnv(seed=1)
+    env.reset()
+    before = env.board.as_list()
+    _, reward, terminated, _, _ = env.step(-1)
+    assert (reward, terminated) == (0, False)
+    assert env.board.as_list() == before
+
+
+def test_info_not_shared_across_episodes():
+    # TimeLimit truncates a non-terminal step and RecordEpisodeStatistics
+    # writes into that step's info; the key must not leak into episode 2
+    env = gym.wrappers.RecordEpisodeStatistics(
+        gym.wrappers.TimeLimit(ReversiEnv(seed=0), max_episode_steps=3)
+    )
+    for _ in range(2):
+        env.reset()
+        done = False
+        while not done:
+            legal = env.unwrapped.board.legal_moves()
+            _, _, terminated, truncated, info = env.step(legal[0] if legal else 64)
+            done = terminated or truncated
+        assert "episode" in info
+
+
+def test_vec_reset_and_step():
+    env = VecReversiEnv(4, seed=1)
+    obs, _ = env.reset()
+    assert obs.shape == (4, 65)
+    assert obs.dtype == np.int8
+    # first legal move of every board
+    masks = env.boards.legal_masks()
+    actions = np.array([(m & -m).bit_length() - 1 for m in masks])
+    obs, rewards, terminated, truncated, _ = env.step(actions)
+    assert obs.shape == (4, 65)
+    assert (obs[:, 64] == 1).all()  # black to move again after the reply
+    assert (np.count_nonzero(obs[:, :64], axis=1) == 6).all()
+    assert not terminated.any()
+    assert not truncated.any()
+    assert (rewards == 0).all()